@@ -4,11 +4,10 @@
 # Literally 10x larger than a basic Streamlit app, modular, styled, extensible
 # ==================================================================================================
 
+import numpy as np
 import streamlit as st
-from abc import ABC, abstractmethod
-from datetime import date, timedelta
-import math
-import random
+from datetime import date
+from types import SimpleNamespace
 
 # ==================================================================================================
 # PAGE CONFIG & GLOBAL STYLE
@@ -21,26 +20,29 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-st.markdown(
-    """
-    <style>
-    .main-title {font-size: 3rem; font-weight: 800;}
-    .section {padding: 1.5rem 0;}
-    .metric-box {background: #111827; padding: 1rem; border-radius: 1rem;}
-    .city-card {background: #0f172a; padding: 1.2rem; border-radius: 1.2rem; margin-bottom: 1rem;}
-    .good {color: #22c55e;}
-    .warn {color: #facc15;}
-    .bad {color: #ef4444;}
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+CSS = """
+<style>
+.main-title {font-size: 3rem; font-weight: 800;}
+.section {padding: 1.5rem 0;}
+.metric-box {background: #111827; padding: 1rem; border-radius: 1rem;}
+.grid4 {display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; margin-bottom: 1rem;}
+.city-card {background: #0f172a; padding: 1.2rem; border-radius: 1.2rem; margin-bottom: 1rem;}
+.good {color: #22c55e;}
+.warn {color: #facc15;}
+.bad {color: #ef4444;}
+</style>
+"""
+
+# Streamlit drops any element a rerun does not re-emit, so the stylesheet is sent on every run
+st.markdown(CSS, unsafe_allow_html=True)
 
 # ==================================================================================================
 # DOMAIN MODELS
 # ==================================================================================================
 
 class City:
+    __slots__ = ("name", "country", "hotel", "food", "safety", "internet", "walkability", "nightlife", "culture")
+
     def __init__(self, name, country, hotel, food, safety, internet, walkability, nightlife, culture):
         self.name = name
         self.country = country
@@ -52,64 +54,51 @@ class City:
         self.nightlife = nightlife
         self.culture = culture
 
-    def score(self):
-        return round((self.safety + self.internet + self.walkability + self.culture) / 4, 2)
-
-
-class TravelerProfile:
-    def __init__(self, budget, pace, priorities):
-        self.budget = budget
-        self.pace = pace
-        self.priorities = priorities
-
 
 # ==================================================================================================
-# TRANSPORT SYSTEM (STRATEGY + POLYMORPHISM)
+# TRANSPORT SYSTEM
 # ==================================================================================================
 
-class Transport(ABC):
-    def __init__(self, name, price_km, speed, comfort, eco):
-        self._name = name
-        self.price_km = price_km
-        self.speed = speed
-        self.comfort = comfort
-        self.eco = eco
-
-    def name(self):
-        return self._name
-
-    def cost(self, km):
-        return km * self.price_km
-
-    def time(self, km):
-        return km / self.speed
-
+TRANSPORTS = np.array(
+    [
+        ("🚗 Car", 0.25, 80, 7, 6),
+        ("🚆 Train", 0.18, 130, 8, 9),
+        ("✈️ Plane", 0.45, 650, 9, 3),
+        ("🚌 Bus", 0.12, 70, 5, 7),
+    ],
+    dtype=[("name", "U16"), ("price_km", "f8"), ("speed", "i2"), ("comfort", "i1"), ("eco", "i1")],
+)
+PRICES_KM = TRANSPORTS["price_km"]
+SPEEDS = TRANSPORTS["speed"]
+COMFORTS = TRANSPORTS["comfort"]
+ECOS = TRANSPORTS["eco"]
 
-class Car(Transport):
-    def __init__(self): super().__init__("🚗 Car", 0.25, 80, 7, 6)
 
-class Train(Transport):
-    def __init__(self): super().__init__("🚆 Train", 0.18, 130, 8, 9)
+def trip_cost(transport, km):
+    return km * transport["price_km"]
 
-class Plane(Transport):
-    def __init__(self): super().__init__("✈️ Plane", 0.45, 650, 9, 3)
 
-class Bus(Transport):
-    def __init__(self): super().__init__("🚌 Bus", 0.12, 70, 5, 7)
+def trip_time(transport, km):
+    return km / transport["speed"]
 
 
 # ==================================================================================================
 # DATA STORE (EXPANDABLE)
 # ==================================================================================================
 
-CITIES = {
-    "Sofia": City("Sofia", "Bulgaria", 70, 20, 7, 8, 6, 6, 8),
-    "Belgrade": City("Belgrade", "Serbia", 65, 22, 6, 7, 6, 7, 7),
-    "Budapest": City("Budapest", "Hungary", 75, 23, 8, 8, 7, 8, 8),
-    "Vienna": City("Vienna", "Austria", 95, 30, 9, 9, 8, 6, 9),
-    "Prague": City("Prague", "Czech Republic", 85, 25, 8, 8, 9, 7, 9),
-    "Munich": City("Munich", "Germany", 100, 28, 9, 9, 8, 6, 8),
-}
+@st.cache_resource
+def load_cities():
+    return {
+        "Sofia": City("Sofia", "Bulgaria", 70, 20, 7, 8, 6, 6, 8),
+        "Belgrade": City("Belgrade", "Serbia", 65, 22, 6, 7, 6, 7, 7),
+        "Budapest": City("Budapest", "Hungary", 75, 23, 8, 8, 7, 8, 8),
+        "Vienna": City("Vienna", "Austria", 95, 30, 9, 9, 8, 6, 9),
+        "Prague": City("Prague", "Czech Republic", 85, 25, 8, 8, 9, 7, 9),
+        "Munich": City("Munich", "Germany", 100, 28, 9, 9, 8, 6, 8),
+    }
+
+
+CITIES = load_cities()
 
 ROUTES = {
     "Balkan Core": ["Sofia", "Belgrade", "Budapest"],
@@ -117,28 +106,88 @@ ROUTES = {
     "Grand Explorer": ["Sofia", "Belgrade", "Budapest", "Vienna", "Prague", "Munich"],
 }
 
+
+def load_city_table(cities):
+    # Structure-of-arrays view of cities: one column per attribute, rows in dict order
+    names = np.array(list(cities))
+    row = {name: i for i, name in enumerate(names)}
+    safety = np.array([c.safety for c in cities.values()], dtype=np.int8)
+    internet = np.array([c.internet for c in cities.values()], dtype=np.int8)
+    walkability = np.array([c.walkability for c in cities.values()], dtype=np.int8)
+    culture = np.array([c.culture for c in cities.values()], dtype=np.int8)
+    return SimpleNamespace(
+        names=names,
+        hotel=np.array([c.hotel for c in cities.values()], dtype=np.int16),
+        food=np.array([c.food for c in cities.values()], dtype=np.int16),
+        safety=safety,
+        internet=internet,
+        walkability=walkability,
+        nightlife=np.array([c.nightlife for c in cities.values()], dtype=np.int8),
+        culture=culture,
+        score=((safety + internet + walkability + culture) / 4).round(2),
+        route_idx={name: np.array([row[c] for c in route]) for name, route in ROUTES.items()},
+    )
+
+
+CITY_TABLE = load_city_table(CITIES)
+
 DISTANCE_PER_SEGMENT = 300
 
+CARD_TEMPLATE = (
+    '<div class="city-card">'
+    "<h3>📍 %(name)s, %(country)s</h3>"
+    "<p>🏨 Hotel: €%(hotel)s/night | 🍽️ Food: €%(food)s/day</p>"
+    "<p>🛡️ Safety: %(safety)s/10 | 🛜 Internet: %(internet)s/10 | 🚶 Walkability: %(walkability)s/10</p>"
+    "<p>🎭 Culture: %(culture)s/10 | 🌃 Nightlife: %(nightlife)s/10</p>"
+    "<strong>⭐ City score: %(score)s/10</strong>"
+    "</div>"
+)
+
+
+def _precompute_routes():
+    t = CITY_TABLE
+    stats = {}
+    for name, idx in t.route_idx.items():
+        stats[name] = SimpleNamespace(
+            km=(len(idx) - 1) * DISTANCE_PER_SEGMENT,
+            n=len(idx),
+            nightlife_top=str(t.names[idx[t.nightlife[idx].argmax()]]),
+            culture_top=str(t.names[idx[t.culture[idx].argmax()]]),
+            hotel_sum=int(t.hotel[idx].sum()),
+            food_sum=int(t.food[idx].sum()),
+        )
+    return stats
+
+
+ROUTE_STATS = _precompute_routes()
+
 # ==================================================================================================
 # DECISION ENGINES
 # ==================================================================================================
 
-def recommend_transport(profile: TravelerProfile, km):
-    options = [Car(), Train(), Plane(), Bus()]
-    scored = []
-    for t in options:
-        score = 0
-        if "Low cost" in profile.priorities:
-            score -= t.cost(km) / 100
-        if "Comfort" in profile.priorities:
-            score += t.comfort * 2
-        if "Eco" in profile.priorities:
-            score += t.eco * 2
-        if "Fast" in profile.priorities:
-            score += t.speed / 100
-        scored.append((score, t))
-    scored.sort(reverse=True, key=lambda x: x[0])
-    return scored[0][1]
+PRI_LOW_COST, PRI_COMFORT, PRI_FAST, PRI_ECO, PRI_NIGHTLIFE, PRI_CULTURE = 1, 2, 4, 8, 16, 32
+
+PRIORITY_BITS = {
+    "Low cost": PRI_LOW_COST,
+    "Comfort": PRI_COMFORT,
+    "Fast": PRI_FAST,
+    "Eco": PRI_ECO,
+    "Nightlife": PRI_NIGHTLIFE,
+    "Culture": PRI_CULTURE,
+}
+
+
+def recommend_transport(mask: int, km):
+    scores = np.zeros(len(TRANSPORTS))
+    if mask & PRI_LOW_COST:
+        scores -= km * PRICES_KM / 100
+    if mask & PRI_COMFORT:
+        scores += COMFORTS * 2
+    if mask & PRI_ECO:
+        scores += ECOS * 2
+    if mask & PRI_FAST:
+        scores += SPEEDS / 100
+    return TRANSPORTS[scores.argmax()]
 
 
 def budget_risk(total, budget):
@@ -148,10 +197,22 @@ def budget_risk(total, budget):
     return "HIGH"
 
 
+# ==================================================================================================
+# RENDERING HELPERS
+# ==================================================================================================
+
+def metric(label, value):
+    return f'<div class="metric-box"><small>{label}</small><h3>{value}</h3></div>'
+
+
 # ==================================================================================================
 # SIDEBAR — CONTROL PANEL
 # ==================================================================================================
 
+def _update_priority_mask():
+    st.session_state.priority_mask = sum(PRIORITY_BITS[p] for p in st.session_state.priorities)
+
+
 st.sidebar.title("🧠 Control Panel")
 
 route_name = st.sidebar.selectbox("Route", ROUTES.keys())
@@ -159,12 +220,13 @@ budget = st.sidebar.number_input("Total budget (€)", 500, 20000, 3500)
 start_date = st.sidebar.date_input("Start date", date.today())
 days_city = st.sidebar.slider("Days per city", 1, 7, 3)
 
-priorities = st.sidebar.multiselect(
+st.sidebar.multiselect(
     "Your priorities",
-    ["Low cost", "Comfort", "Fast", "Eco", "Nightlife", "Culture"]
+    list(PRIORITY_BITS),
+    key="priorities",
+    on_change=_update_priority_mask,
 )
-
-profile = TravelerProfile(budget, "normal", priorities)
+mask = st.session_state.setdefault("priority_mask", 0)
 
 # ==================================================================================================
 # MAIN UI
@@ -174,25 +236,24 @@ st.markdown('<div class="main-title">🌍 Travel OS</div>', unsafe_allow_html=Tr
 st.caption("A serious travel decision system — not a toy planner")
 
 cities = ROUTES[route_name]
-segments = len(cities) - 1
-km_total = segments * DISTANCE_PER_SEGMENT
+stats = ROUTE_STATS[route_name]
+km_total = stats.km
 
-transport = recommend_transport(profile, km_total)
+transport = recommend_transport(mask, km_total)
 
 # --------------------------------------------------------------------------------------------------
 # OVERVIEW METRICS
 # --------------------------------------------------------------------------------------------------
 
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.metric("Route length", f"{km_total} km")
-with col2:
-    st.metric("Recommended transport", transport.name())
-with col3:
-    st.metric("Cities", len(cities))
-with col4:
-    st.metric("Days", len(cities) * days_city)
+overview_html = (
+    '<div class="grid4">'
+    f'{metric("Route length", f"{km_total} km")}'
+    f'{metric("Recommended transport", transport["name"])}'
+    f'{metric("Cities", stats.n)}'
+    f'{metric("Days", stats.n * days_city)}'
+    "</div>"
+)
+st.markdown(overview_html, unsafe_allow_html=True)
 
 # --------------------------------------------------------------------------------------------------
 # CITY CARDS
@@ -200,30 +261,25 @@ with col4:
 
 st.markdown("## 🏙️ City Intelligence")
 
-hotel_total = 0
-food_total = 0
-
-for c in cities:
-    city = CITIES[c]
-    hotel_total += city.hotel * days_city
-    food_total += city.food * days_city
+hotel_total = stats.hotel_sum * days_city
+food_total = stats.food_sum * days_city
 
-    st.markdown(f"""
-    <div class="city-card">
-        <h3>📍 {city.name}, {city.country}</h3>
-        <p>🏨 Hotel: €{city.hotel}/night | 🍽️ Food: €{city.food}/day</p>
-        <p>🛡️ Safety: {city.safety}/10 | 🛜 Internet: {city.internet}/10 | 🚶 Walkability: {city.walkability}/10</p>
-        <p>🎭 Culture: {city.culture}/10 | 🌃 Nightlife: {city.nightlife}/10</p>
-        <strong>⭐ City score: {city.score()}/10</strong>
-    </div>
-    """, unsafe_allow_html=True)
+html_parts = [
+    CARD_TEMPLATE % dict(
+        name=city.name, country=city.country, hotel=city.hotel, food=city.food,
+        safety=city.safety, internet=city.internet, walkability=city.walkability,
+        culture=city.culture, nightlife=city.nightlife, score=score,
+    )
+    for city, score in zip((CITIES[c] for c in cities), CITY_TABLE.score[CITY_TABLE.route_idx[route_name]])
+]
+st.markdown("".join(html_parts), unsafe_allow_html=True)
 
 # --------------------------------------------------------------------------------------------------
 # COST ENGINE
 # --------------------------------------------------------------------------------------------------
 
-transport_cost = transport.cost(km_total)
-transport_time = transport.time(km_total)
+transport_cost = float(trip_cost(transport, km_total))
+transport_time = float(trip_time(transport, km_total))
 
 total_cost = hotel_total + food_total + transport_cost
 
@@ -248,15 +304,13 @@ else: st.error("🔴 Budget risk: HIGH")
 
 st.markdown("## 🧠 System Insights")
 
-if "Nightlife" in priorities:
-    top = max(cities, key=lambda x: CITIES[x].nightlife)
-    st.info(f"🌃 Best nightlife on this route: {top}")
+if mask & PRI_NIGHTLIFE:
+    st.info(f"🌃 Best nightlife on this route: {stats.nightlife_top}")
 
-if "Culture" in priorities:
-    top = max(cities, key=lambda x: CITIES[x].culture)
-    st.info(f"🎭 Cultural highlight: {top}")
+if mask & PRI_CULTURE:
+    st.info(f"🎭 Cultural highlight: {stats.culture_top}")
 
-if transport.eco < 5 and "Eco" in priorities:
+if mask & PRI_ECO and transport["eco"] < 5:
     st.warning("♻️ Your eco priority conflicts with transport choice")
 
 st.caption("Travel OS v1 — architecture built to scale into a real product")